@@ -1,3 +1,5 @@
+import numpy as np
+
 # Standard tuning of each string
 GUITAR_STAFF: dict = {0: 'E', 1: 'A', 2: 'D', 3: 'G', 4: 'B', 5: 'E'}
 UKULELE_STAFF: dict = {0: 'G', 1: 'C', 2: 'E', 3: 'A'}
@@ -165,66 +167,87 @@ MIDI_TO_NOTES = {
     99: ['D#7', 'Eb7']
 }
 
-# Note to string and fret mappings
-NOTE_TO_STRING =  \
-    {'F4': {1: 1, 2: 6, 3: 10, 4: 15, 5: 20, 6: ''},
-     'F#4': {1: 2, 2: 7, 3: 11, 4: 16, 5: 21, 6: ''},
-     'G4': {1: 3, 2: 8, 3: 12, 4: 17, 5: 22, 6: ''},
-     'Ab4': {1: 4, 2: 9, 3: 13, 4: 18, 5: '', 6: ''},
-     'G#4': {1: 4, 2: 9, 3: 13, 4: 18, 5: '', 6: ''},
-     'A4': {1: 5, 2: 10, 3: 14, 4: 19, 5: '', 6: ''},
-     'Bb4': {1: 6, 2: 11, 3: 15, 4: 20, 5: '', 6: ''},
-     'A#4': {1: 6, 2: 11, 3: 15, 4: 20, 5: '', 6: ''},
-     'B4': {1: 7, 2: 12, 3: 16, 4: 21, 5: '', 6: ''},
-     'C5': {1: 8, 2: 13, 3: 17, 4: 22, 5: '', 6: ''},
-     'C#5': {1: 9, 2: 14, 3: 18, 4: '', 5: '', 6: ''},
-     'D5': {1: 10, 2: 15, 3: 19, 4: '', 5: '', 6: ''},
-     'Eb5': {1: 11, 2: 16, 3: 20, 4: '', 5: '', 6: ''},
-     'D#5': {1: 11, 2: 16, 3: 20, 4: '', 5: '', 6: ''},
-     'E5': {1: 12, 2: 17, 3: 21, 4: '', 5: '', 6: ''},
-     'F5': {1: 13, 2: 18, 3: 22, 4: '', 5: '', 6: ''},
-     'F#5': {1: 14, 2: 19, 3: '', 4: '', 5: '', 6: ''},
-     'G5': {1: 15, 2: 20, 3: '', 4: '', 5: '', 6: ''},
-     'Ab5': {1: 16, 2: 21, 3: '', 4: '', 5: '', 6: ''},
-     'G#5': {1: 16, 2: 21, 3: '', 4: '', 5: '', 6: ''},
-     'A5': {1: 17, 2: 22, 3: '', 4: '', 5: '', 6: ''},
-     'Bb5': {1: 18, 2: '', 3: '', 4: '', 5: '', 6: ''},
-     'A#5': {1: 18, 2: '', 3: '', 4: '', 5: '', 6: ''},
-     'B5': {1: 19, 2: '', 3: '', 4: '', 5: '', 6: ''},
-     'C6': {1: 20, 2: '', 3: '', 4: '', 5: '', 6: ''},
-     'C#6': {1: 21, 2: '', 3: '', 4: '', 5: '', 6: ''},
-     'D6': {1: 22, 2: '', 3: '', 4: '', 5: '', 6: ''},
-     'C4': {1: '', 2: 1, 3: 5, 4: 10, 5: 15, 6: 20},
-     'C#4': {1: '', 2: 2, 3: 6, 4: 11, 5: 16, 6: 21},
-     'D4': {1: '', 2: 3, 3: 7, 4: 12, 5: 17, 6: 22},
-     'Eb4': {1: '', 2: 4, 3: 8, 4: 13, 5: 18, 6: ''},
-     'D#4': {1: '', 2: 4, 3: 8, 4: 13, 5: 18, 6: ''},
-     'E4': {1: '', 2: 5, 3: 9, 4: 14, 5: 19, 6: ''},
-     'Ab3': {1: '', 2: '', 3: 1, 4: 6, 5: 11, 6: 16},
-     'G#3': {1: '', 2: '', 3: 1, 4: 6, 5: 11, 6: 16},
-     'A3': {1: '', 2: '', 3: 2, 4: 7, 5: 12, 6: 17},
-     'Bb3': {1: '', 2: '', 3: 3, 4: 8, 5: 13, 6: 18},
-     'A#3': {1: '', 2: '', 3: 3, 4: 8, 5: 13, 6: 18},
-     'B3': {1: '', 2: '', 3: 4, 4: 9, 5: 14, 6: 19},
-     'Eb3': {1: '', 2: '', 3: '', 4: 1, 5: 6, 6: 11},
-     'D#3': {1: '', 2: '', 3: '', 4: 1, 5: 6, 6: 11},
-     'E3': {1: '', 2: '', 3: '', 4: 2, 5: 7, 6: 12},
-     'F3': {1: '', 2: '', 3: '', 4: 3, 5: 8, 6: 13},
-     'F#3': {1: '', 2: '', 3: '', 4: 4, 5: 9, 6: 14},
-     'G3': {1: '', 2: '', 3: '', 4: 5, 5: 10, 6: 15},
-     'Bb2': {1: '', 2: '', 3: '', 4: '', 5: 1, 6: 6},
-     'A#2': {1: '', 2: '', 3: '', 4: '', 5: 1, 6: 6},
-     'B2': {1: '', 2: '', 3: '', 4: '', 5: 2, 6: 7},
-     'C3': {1: '', 2: '', 3: '', 4: '', 5: 3, 6: 8},
-     'C#3': {1: '', 2: '', 3: '', 4: '', 5: 4, 6: 9},
-     'D3': {1: '', 2: '', 3: '', 4: '', 5: 5, 6: 10},
-     'F2': {1: '', 2: '', 3: '', 4: '', 5: '', 6: 1},
-     'F#2': {1: '', 2: '', 3: '', 4: '', 5: '', 6: 2},
-     'G2': {1: '', 2: '', 3: '', 4: '', 5: '', 6: 3},
-     'Ab2': {1: '', 2: '', 3: '', 4: '', 5: '', 6: 4},
-     'G#2': {1: '', 2: '', 3: '', 4: '', 5: '', 6: 4},
-     'A2': {1: '', 2: '', 3: '', 4: '', 5: '', 6: 5},
-     'B1': {1: '', 2: '', 3: '', 4: '', 5: '', 6: 5}}
+# Sharp spelling of flat note names, the only spelling used by the fret table
+CANONICAL = {'Db': 'C#', 'Eb': 'D#', 'Gb': 'F#', 'Ab': 'G#', 'Bb': 'A#'}
+
+# Note to fret on each string (1 to 6) mappings, -1 where the note can't be played
+NOTE_FRETS = (
+    ('F4',   ( 1,  6, 10, 15, 20, -1)),
+    ('F#4',  ( 2,  7, 11, 16, 21, -1)),
+    ('G4',   ( 3,  8, 12, 17, 22, -1)),
+    ('G#4',  ( 4,  9, 13, 18, -1, -1)),
+    ('A4',   ( 5, 10, 14, 19, -1, -1)),
+    ('A#4',  ( 6, 11, 15, 20, -1, -1)),
+    ('B4',   ( 7, 12, 16, 21, -1, -1)),
+    ('C5',   ( 8, 13, 17, 22, -1, -1)),
+    ('C#5',  ( 9, 14, 18, -1, -1, -1)),
+    ('D5',   (10, 15, 19, -1, -1, -1)),
+    ('D#5',  (11, 16, 20, -1, -1, -1)),
+    ('E5',   (12, 17, 21, -1, -1, -1)),
+    ('F5',   (13, 18, 22, -1, -1, -1)),
+    ('F#5',  (14, 19, -1, -1, -1, -1)),
+    ('G5',   (15, 20, -1, -1, -1, -1)),
+    ('G#5',  (16, 21, -1, -1, -1, -1)),
+    ('A5',   (17, 22, -1, -1, -1, -1)),
+    ('A#5',  (18, -1, -1, -1, -1, -1)),
+    ('B5',   (19, -1, -1, -1, -1, -1)),
+    ('C6',   (20, -1, -1, -1, -1, -1)),
+    ('C#6',  (21, -1, -1, -1, -1, -1)),
+    ('D6',   (22, -1, -1, -1, -1, -1)),
+    ('C4',   (-1,  1,  5, 10, 15, 20)),
+    ('C#4',  (-1,  2,  6, 11, 16, 21)),
+    ('D4',   (-1,  3,  7, 12, 17, 22)),
+    ('D#4',  (-1,  4,  8, 13, 18, -1)),
+    ('E4',   (-1,  5,  9, 14, 19, -1)),
+    ('G#3',  (-1, -1,  1,  6, 11, 16)),
+    ('A3',   (-1, -1,  2,  7, 12, 17)),
+    ('A#3',  (-1, -1,  3,  8, 13, 18)),
+    ('B3',   (-1, -1,  4,  9, 14, 19)),
+    ('D#3',  (-1, -1, -1,  1,  6, 11)),
+    ('E3',   (-1, -1, -1,  2,  7, 12)),
+    ('F3',   (-1, -1, -1,  3,  8, 13)),
+    ('F#3',  (-1, -1, -1,  4,  9, 14)),
+    ('G3',   (-1, -1, -1,  5, 10, 15)),
+    ('A#2',  (-1, -1, -1, -1,  1,  6)),
+    ('B2',   (-1, -1, -1, -1,  2,  7)),
+    ('C3',   (-1, -1, -1, -1,  3,  8)),
+    ('C#3',  (-1, -1, -1, -1,  4,  9)),
+    ('D3',   (-1, -1, -1, -1,  5, 10)),
+    ('F2',   (-1, -1, -1, -1, -1, -1)),
+    ('F#2',  (-1, -1, -1, -1, -1,  2)),
+    ('G2',   (-1, -1, -1, -1, -1,  3)),
+    ('G#2',  (-1, -1, -1, -1, -1,  4)),
+    ('A2',   (-1, -1, -1, -1, -1,  5)),
+    ('B1',   (-1, -1, -1, -1, -1, -1)),
+    ('C#2',  (-1, -1, -1, -1, -1, -1)),
+    ('D2',   (-1, -1, -1, -1, -1, -1)),
+    ('D#2',  (-1, -1, -1, -1, -1, -1)),
+    ('E2',   (-1, -1, -1, -1, -1, -1)),
+    ('F#1',  (-1, -1, -1, -1, -1, -1)),
+    ('G1',   (-1, -1, -1, -1, -1, -1)),
+    ('G#1',  (-1, -1, -1, -1, -1, -1)),
+    ('A1',   (-1, -1, -1, -1, -1, -1)),
+    ('A#1',  (-1, -1, -1, -1, -1, -1)),
+    ('F7',   (14, 19, -1, -1, -1, -1)),
+)
+
+# Row of each note in the fret table
+NOTE_INDEX = {name: idx for idx, (name, _) in enumerate(NOTE_FRETS)}
+
+# Fret of each note on every string, -1 where the note can't be played
+FRET_TABLE = np.array([frets for _, frets in NOTE_FRETS], dtype=np.int8)
+
+# Fret row of each MIDI code
+MIDI_TO_FRETROW = np.full((128, GUITAR_STRING), -1, dtype=np.int8)
+for _code, _names in MIDI_TO_NOTES.items():
+    if _names[0] in NOTE_INDEX:
+        MIDI_TO_FRETROW[_code] = FRET_TABLE[NOTE_INDEX[_names[0]]]
+
+# Playable (fret, string) positions of each MIDI code, strings in order
+MIDI_TO_POSITIONS = tuple(
+    tuple((fret, string) for string, fret in enumerate(row, 1) if fret >= 0)
+    for row in MIDI_TO_FRETROW.tolist()
+)
 
 # Max length of tablature in CLI mode
 MAX_RENDER_COLUMNS = 70
@@ -251,6 +274,11 @@ SCALE = {
     'jazz_minor': [2, 1, 2, 2, 2, 2, 1],
 }
 
+SCALE_STEPS = {name: np.array(steps, dtype=np.int8) for name, steps in SCALE.items()}
+
+# Number of scale steps walked from a start position
+SCALE_SPAN = 8
+
 
 MAJOR = 'major'
 IONIAN = 'ionian'
@@ -261,3 +289,47 @@ LOCRIAN = 'locrian'
 MINOR = 'minor'
 AEOLIAN = 'aeolian'
 JAZZ_MINOR = 'jazz_minor'
+
+# Name of each MIDI code
+MIDI_TO_NAME = np.array([MIDI_TO_NOTES[code][0] for code in range(128)], dtype=object)
+
+# Upper bounds in beats of the note getting the beat and of the one getting two
+NOTE_TYPE_BEATS = [1.5, 2.5]
+
+# Quarter lengths of each note type
+NOTE_TYPE_LENGTH = {WHOLE_NOTE: 4.0, HALF_NOTE: 2.0, QUARTER_NOTE: 1.0,
+                    EIGHTH_NOTE: 0.5, SIXTEENTH_NOTE: 0.25}
+
+# Key profile weightings (major, minor), as used by music21 key analysis
+KRUMHANSL_SCHMUCKLER = \
+    ([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88],
+     [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+KRUMHANSL_KESSLER = KRUMHANSL_SCHMUCKLER
+BELLMAN_BUDGE = \
+    ([16.80, 0.86, 12.95, 1.41, 13.49, 11.93, 1.25, 20.28, 1.80, 8.04, 0.62, 10.57],
+     [18.16, 0.69, 12.99, 13.34, 1.07, 11.15, 1.38, 21.07, 7.49, 1.53, 0.92, 10.21])
+AARDEN_ESSEN = \
+    ([17.7661, 0.145624, 14.9265, 0.160186, 19.8049, 11.3587, 0.291248, 22.062, 0.145624, 8.15494, 0.232998, 4.95122],
+     [18.2648, 0.737619, 14.0499, 16.8599, 0.702494, 14.4362, 0.702494, 18.6161, 4.56621, 1.93186, 7.37619, 1.75623])
+TEMPERLEY_KOSTKA_PAYNE = \
+    ([0.748, 0.060, 0.488, 0.082, 0.670, 0.460, 0.096, 0.715, 0.104, 0.366, 0.057, 0.400],
+     [0.712, 0.084, 0.474, 0.618, 0.049, 0.460, 0.105, 0.747, 0.404, 0.067, 0.133, 0.330])
+
+KEY_MODES = (MAJOR, MINOR)
+
+# Tonic spelled for each pitch class, as music21 key analysis spells it
+KEY_TONICS = {
+    MAJOR: ('C', 'C#', 'D', 'E-', 'E', 'F', 'F#', 'G', 'A-', 'A', 'B-', 'B'),
+    MINOR: ('C', 'C#', 'D', 'E-', 'E', 'F', 'F#', 'G', 'G#', 'A', 'B-', 'B'),
+}
+
+# Weightings voting for the key, the default key weight analysis being
+# Krumhansl-Schmuckler
+KEY_WEIGHTINGS = [KRUMHANSL_SCHMUCKLER, KRUMHANSL_SCHMUCKLER, BELLMAN_BUDGE,
+                  AARDEN_ESSEN, KRUMHANSL_KESSLER, TEMPERLEY_KOSTKA_PAYNE]
+
+# Mean centered weightings rotated to every tonic: (weighting, mode, tonic, pitch class)
+_weights = np.array(KEY_WEIGHTINGS)
+_weights -= _weights.mean(axis=-1, keepdims=True)
+KEY_PROFILES = _weights[..., (np.arange(12) - np.arange(12)[:, None]) % 12]
+KEY_PROFILE_NORMS = np.sqrt((_weights ** 2).sum(axis=-1, keepdims=True))